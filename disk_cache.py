@@ -0,0 +1,130 @@
+"""
+Small disk-backed LRU cache and atomic file replacement.
+
+Hot entries live in an in-memory LRU; every entry is also stored as one file
+under a cache directory, so it survives restarts and can be shared by
+separate processes (the orchestrator and the MCP server subprocesses).
+Used for the LLM response cache (model_tracker) and the MCP tool result
+cache (orchestrator_client).
+
+replace_file is shared by the writers that build a file under a temporary
+name (from tempfile.mkstemp) and rename it into place: the usage file and
+the semantic cache index.
+"""
+
+import os
+import stat
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+# Process umask, read once at import (os.umask can only be read by setting it,
+# which would race with files created by other threads later on)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def replace_file(tmp_path: Union[str, Path], path: Union[str, Path]) -> None:
+    """
+    Atomically rename a temporary file over path, keeping normal permissions.
+    
+    tempfile.mkstemp creates files readable only by their owner, and the
+    rename would carry that mode over to path. The temporary file is given
+    path's current mode instead, or the mode a newly created file would get
+    (0o666 minus the umask) if path does not exist yet.
+    
+    Args:
+        tmp_path: Fully written temporary file in the same directory as path
+        path: File to replace
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+
+class DiskLRUCache:
+    """
+    In-memory LRU backed by one file per key.
+    
+    All methods are thread-safe. Disk access is best-effort: I/O errors and
+    entries that fail to deserialize count as misses, and a failed write
+    still keeps the in-memory entry. The methods do blocking file I/O, so
+    async callers should run them in a worker thread.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_size: int = 128,
+        dumps: Callable[[Any], str] = str,
+        loads: Callable[[str], Any] = str,
+    ) -> None:
+        """
+        Args:
+            directory: Directory holding one file per cached entry (created on first write)
+            max_size: Maximum number of entries kept in memory
+            dumps: Converts a value to the text stored on disk
+            loads: Converts stored text back to a value; raising ValueError
+                marks the entry as invalid
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self._dumps = dumps
+        self._loads = loads
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up an entry, checking memory first and then disk.
+        
+        Args:
+            key: Cache key (used as the file name, so it must be path-safe)
+        
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        try:
+            value = self._loads((self.directory / key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store an entry in memory and on disk.
+        
+        The disk entry is written to a temporary file and renamed into place so
+        other processes never read a partially written entry.
+        
+        Args:
+            key: Cache key (used as the file name, so it must be path-safe)
+            value: Value to cache
+        """
+        self._remember(key, value)
+        try:
+            self.directory.mkdir(exist_ok=True)
+            tmp_path = self.directory / f"{key}.{os.getpid()}.tmp"
+            tmp_path.write_text(self._dumps(value), encoding="utf-8")
+            os.replace(tmp_path, self.directory / key)
+        except OSError:
+            # The disk layer is best-effort; the in-memory entry still applies
+            pass
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert an entry into the in-memory LRU, evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
@@ -7,12 +7,23 @@ descriptions and receive generated Python applications with tests packaged in a
 """
 
 import os
+import queue
+from typing import Optional
 
 # Disable Gradio telemetry / analytics (and related pandas quirks)
 os.environ.setdefault("GRADIO_ANALYTICS_ENABLED", "False")
 
 import gradio as gr
-from orchestrator.orchestrator_client import run_pipeline
+from orchestrator.orchestrator_client import run_pipeline_batch, start_pipeline
+
+# Maximum number of queued API requests processed together by the batch endpoint
+MAX_BATCH_SIZE = 8
+
+# Generation requests allowed to run at once; tune to the Gemini rate-limit quota
+CONCURRENCY_LIMIT = 4
+
+# Requests allowed to wait in the queue before new ones are rejected
+MAX_QUEUE_SIZE = 64
 
 
 def generate_app_and_tests(description: str):
@@ -20,26 +31,85 @@ def generate_app_and_tests(description: str):
     Main handler function for the Gradio interface.
     
     Takes a user-provided description, runs it through the code generation pipeline,
-    and returns the generated ZIP file path and model usage statistics.
+    and streams the application code into the UI as it is generated. Once the
+    pipeline finishes, the generated ZIP file path and model usage statistics
+    are emitted.
     
     Args:
         description: User-provided text description of the desired application
         
-    Returns:
-        Tuple of (zip_file_path, model_usage_dict)
+    Yields:
+        Tuples of (zip_file_path, model_usage_dict, app_code_so_far); the ZIP
+        path and usage are None until the pipeline completes
         
     Raises:
         gr.Error: If description is empty or pipeline execution fails
     """
     if not description or not description.strip():
         raise gr.Error("Please enter a description for the desired application.")
+
+    # Code chunks arrive on the pipeline's thread; None marks completion
+    chunks: "queue.Queue[Optional[str]]" = queue.Queue()
+    code = ""
+    # Start the full generation pipeline on the orchestrator's background loop
+    future = start_pipeline(description.strip(), chunks.put)
+    future.add_done_callback(lambda _: chunks.put(None))
+    try:
+        while (chunk := chunks.get()) is not None:
+            code += chunk
+            yield None, None, code
+    finally:
+        # If the client went away (Gradio closed this generator), stop the run
+        # instead of letting it finish for nobody
+        future.cancel()
     try:
-        # Call the orchestrator to run the full generation pipeline
-        zip_path, usage = run_pipeline(description.strip())
+        zip_path, usage = future.result()
     except Exception as e:
         # Surface a friendly error in the UI instead of a giant traceback
         raise gr.Error(f"Generation failed: {e}")
-    return zip_path, usage
+    yield zip_path, usage, code
+
+
+def generate_apps_batch(descriptions: list) -> tuple[list[Optional[str]], list[dict]]:
+    """
+    Batched API handler for generating several applications at once.
+    
+    Gradio groups up to MAX_BATCH_SIZE queued requests into one call, and all
+    of their pipelines run concurrently. Gradio does not allow generators in
+    batch mode, so this endpoint does not stream code like the main UI does.
+    
+    Each item is validated on its own, so a malformed request only fails its
+    own entry and never the other requests batched with it.
+    
+    Args:
+        descriptions: One application description per queued request
+        
+    Returns:
+        Tuple of (zip_file_paths, model_usage_dicts), one entry per request.
+        Failed requests get no file and an {"error": ...} usage entry.
+    """
+    zip_paths: list[Optional[str]] = [None] * len(descriptions)
+    usages: list[dict] = []
+    valid = []
+    for i, description in enumerate(descriptions):
+        if not isinstance(description, str):
+            usages.append(
+                {"error": f"Expected a description string, got {type(description).__name__}."}
+            )
+        elif not description.strip():
+            usages.append({"error": "Please enter a description for the desired application."})
+        else:
+            usages.append({})
+            valid.append(i)
+
+    # Only valid descriptions are sent through the pipeline
+    results = run_pipeline_batch([descriptions[i].strip() for i in valid])
+    for i, result in zip(valid, results):
+        if isinstance(result, BaseException):
+            usages[i] = {"error": f"Generation failed: {result}"}
+        else:
+            zip_paths[i], usages[i] = result
+    return zip_paths, usages
 
 
 def main():
@@ -49,8 +119,12 @@ def main():
     Sets up the UI components:
     - Text input for application description
     - Generate button to trigger code generation
+    - Live view of the application code as it streams from the LLM
     - File download output for the generated ZIP
     - JSON output showing model usage statistics
+    - Batched "generate_batch" API endpoint for concurrent requests, wired
+      to hidden components so its schema takes one description per request
+      and its ZIPs are served as downloadable files
     """
     with gr.Blocks(analytics_enabled=False) as demo:
         gr.Markdown("# INF119 Final Project – MCP Code Generator")
@@ -73,6 +147,13 @@ def main():
         # Action button to trigger the generation pipeline
         generate_btn = gr.Button("Generate App & Tests")
 
+        # Live view of the application code while it is being generated
+        code_output = gr.Code(
+            label="Generated App Code (initial draft, live)",
+            language="python",
+            interactive=False,
+        )
+
         # Output section: ZIP file download and usage statistics
         with gr.Row():
             zip_output = gr.File(label="Download Generated ZIP")
@@ -82,11 +163,36 @@ def main():
         generate_btn.click(
             fn=generate_app_and_tests,
             inputs=description_box,
-            outputs=[zip_output, usage_output],
+            outputs=[zip_output, usage_output, code_output],
+            concurrency_limit=CONCURRENCY_LIMIT,
+        )
+
+        # API-only endpoint that batches concurrent requests into one call.
+        # Real (hidden) components give it a per-request schema and let Gradio
+        # serve the generated ZIPs to remote clients.
+        with gr.Row(visible=False):
+            batch_description = gr.Textbox(label="Application Description")
+            batch_zip = gr.File(label="Generated ZIP")
+            batch_usage = gr.JSON(label="Model Usage Report (per model)")
+        batch_trigger = gr.Button(visible=False)
+        batch_trigger.click(
+            fn=generate_apps_batch,
+            inputs=batch_description,
+            outputs=[batch_zip, batch_usage],
+            api_name="generate_batch",
+            batch=True,
+            max_batch_size=MAX_BATCH_SIZE,
+            concurrency_limit=1,
         )
 
-    # Launch the Gradio web server
-    demo.launch()
+    # Bound concurrent work and queue length, then launch the Gradio web server.
+    # api_open=False closes the REST routes that would let requests bypass the
+    # queue; ssr_mode=False skips the server-side rendering process.
+    demo.queue(
+        default_concurrency_limit=CONCURRENCY_LIMIT,
+        max_size=MAX_QUEUE_SIZE,
+        api_open=False,
+    ).launch(ssr_mode=False)
 
 
 if __name__ == "__main__":
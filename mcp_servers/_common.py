@@ -0,0 +1,106 @@
+"""
+Shared setup and helpers for the MCP servers.
+
+Importing this module puts the project root on sys.path (so model_tracker can
+be imported when a server is run as a script) and provides the helpers every
+server uses: access to the shared LLM, text extraction and startup warm-up.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Ensure project root is on sys.path so we can import model_tracker
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from mcp.server.fastmcp import FastMCP
+
+from model_tracker import (  # type: ignore
+    TrackingChatGoogleGenerativeAI,
+    _extract_text,
+    awarm_up_shared_llm,
+    get_shared_llm,
+    set_immediate_usage_flush,
+)
+
+# Re-exported for the servers; never raises (falls back to str(result))
+extract_text = _extract_text
+
+# All agents use Gemini 2.5 Flash with temperature=0 for deterministic output
+MODEL_NAME = "gemini-2.5-flash"
+TEMPERATURE = 0
+
+
+def get_llm() -> Tuple[Optional[TrackingChatGoogleGenerativeAI], Optional[str]]:
+    """
+    Get the shared LLM instance.
+    
+    The instance is created on first use and shared with every other agent
+    in this process (see model_tracker.get_shared_llm).
+    
+    Returns:
+        Tuple of (llm_instance, error_message). If successful, error_message is None.
+    """
+    try:
+        return get_shared_llm(model=MODEL_NAME, temperature=TEMPERATURE), None
+    except Exception as e:
+        return None, f"LLM initialization failed: {e}"
+
+
+async def aget_llm() -> Tuple[Optional[TrackingChatGoogleGenerativeAI], Optional[str]]:
+    """
+    Asynchronous variant of get_llm for use inside tool handlers.
+    
+    The first call imports LangChain and builds the client, which would block
+    the event loop; when the servers run in-process that loop is shared by
+    every pipeline, so the work is done in a worker thread.
+    
+    Returns:
+        Tuple of (llm_instance, error_message). If successful, error_message is None.
+    """
+    return await asyncio.to_thread(get_llm)
+
+
+# Warm-up task started in this process (a reference keeps it from being
+# garbage-collected while it runs)
+_warm_up_task: Optional["asyncio.Task[None]"] = None
+
+
+def start_warm_up() -> None:
+    """
+    Warm up the shared LLM client on the running event loop.
+    
+    Must be called on the loop that serves the tools (the stdio server's loop,
+    or the orchestrator's pipeline loop for in-process servers), because the
+    client's async transport is bound to the loop it is created on. Only the
+    first call in a process starts the warm-up, since all servers in a process
+    share the client.
+    """
+    global _warm_up_task
+    if _warm_up_task is None:
+        _warm_up_task = asyncio.get_running_loop().create_task(
+            awarm_up_shared_llm(model=MODEL_NAME, temperature=TEMPERATURE)
+        )
+
+
+def run_stdio(server: FastMCP) -> None:
+    """
+    Run a server as a stdio subprocess (the orchestrator's fallback mode).
+    
+    Usage is flushed to the usage file as soon as it is recorded, so it is on
+    disk before the tool result reaches the orchestrator, and the LLM client
+    is warmed up while the MCP session starts.
+    
+    Args:
+        server: The server's FastMCP instance
+    """
+    set_immediate_usage_flush()
+
+    async def _serve() -> None:
+        start_warm_up()
+        await server.run_stdio_async()
+
+    asyncio.run(_serve())
@@ -9,89 +9,22 @@ The generated code includes a Gradio GUI and follows strict requirements
 for testability and completeness.
 """
 
-from mcp.server.fastmcp import FastMCP
-from typing import Optional, Tuple
-import sys
-from pathlib import Path
+from mcp.server.fastmcp import Context, FastMCP
+from typing import Optional
+import textwrap
 
-# Ensure project root is on sys.path so we can import model_tracker
-ROOT_DIR = Path(__file__).resolve().parents[1]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
-
-from model_tracker import TrackingChatGoogleGenerativeAI, _extract_text  # type: ignore
+# Works both as a script (python mcp_servers/<server>.py) and as a module
+try:
+    from ._common import aget_llm, extract_text, run_stdio
+except ImportError:
+    from _common import aget_llm, extract_text, run_stdio  # type: ignore
 
 # Initialize the MCP server
 mcp = FastMCP("CodeGenerator")
 
-# Lazy-initialized LLM instance (created on first use)
-_llm = None
-
-
-def _get_text(result) -> str:
-    """
-    Extract text from an LLM result object.
-    
-    Wrapper around _extract_text that handles exceptions gracefully.
-    
-    Args:
-        result: Result object from LLM invocation
-        
-    Returns:
-        Extracted text as string
-    """
-    try:
-        return _extract_text(result)  # type: ignore
-    except Exception:
-        # Fallback to string conversion if extraction fails
-        return str(result)
-
-
-def _get_llm() -> Tuple[Optional[TrackingChatGoogleGenerativeAI], Optional[str]]:
-    """
-    Lazy-initialize the LLM instance.
-    
-    Creates the LLM on first call and reuses it for subsequent calls.
-    This avoids recreating the model connection for each tool invocation.
-    
-    Returns:
-        Tuple of (llm_instance, error_message). If successful, error_message is None.
-    """
-    global _llm
-    if _llm is not None:
-        return _llm, None
-    try:
-        # Use Gemini 2.5 Flash with temperature=0 for deterministic output
-        _llm = TrackingChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
-        return _llm, None
-    except Exception as e:
-        return None, f"LLM initialization failed: {e}"
-
-
-@mcp.tool()
-def generate_app_code(description: str, plan: Optional[str] = None) -> str:
-    """
-    Generate a complete, runnable Python application from a description.
-    
-    Uses an LLM to generate a full Python application with:
-    - Gradio GUI interface
-    - Pure business logic functions (testable)
-    - Standard library + gradio only
-    - Complete, runnable code (no placeholders)
-    
-    Args:
-        description: User-provided description of the desired application
-        plan: Optional high-level implementation plan (if provided)
-        
-    Returns:
-        Complete Python source code as a string, or error message if generation fails
+# Instructions that open every code generation prompt
+_SYSTEM_INSTRUCTIONS = textwrap.dedent(
     """
-    llm, err = _get_llm()
-    if err or llm is None:
-        return f"ERROR: {err}"
-
-    # Detailed system instructions for the LLM to follow
-    system_instructions = """
     You are an expert Python software engineer.
 
     Your task is to produce a single, complete, self-contained, fully runnable Python application
@@ -137,10 +70,44 @@ def generate_app_code(description: str, plan: Optional[str] = None) -> str:
 
     The result MUST be a COMPLETE Python file that runs as-is.
     """
+).strip()
+
+
+@mcp.tool()
+async def generate_app_code(
+    description: str,
+    plan: Optional[str] = None,
+    ctx: Optional[Context] = None,
+) -> str:
+    """
+    Generate a complete, runnable Python application from a description.
+    
+    Uses an LLM to generate a full Python application with:
+    - Gradio GUI interface
+    - Pure business logic functions (testable)
+    - Standard library + gradio only
+    - Complete, runnable code (no placeholders)
+    
+    The response is streamed from the LLM; each chunk is forwarded to the
+    client as the message of a progress notification (progress counts the
+    characters generated so far), so it can render code live. Progress is
+    only sent when the client asked for it with a progress token.
+    
+    Args:
+        description: User-provided description of the desired application
+        plan: Optional high-level implementation plan (if provided)
+        ctx: MCP request context (injected by FastMCP)
+        
+    Returns:
+        Complete Python source code as a string, or error message if generation fails
+    """
+    llm, err = await aget_llm()
+    if err or llm is None:
+        return f"ERROR: {err}"
 
     # Build the prompt with description and optional plan
     prompt_parts = [
-        system_instructions.strip(),
+        _SYSTEM_INSTRUCTIONS,
         "\n\nApplication Description:\n",
         description.strip(),
     ]
@@ -148,12 +115,21 @@ def generate_app_code(description: str, plan: Optional[str] = None) -> str:
         prompt_parts.append("\n\nHigh-Level Plan:\n")
         prompt_parts.append(plan.strip())
 
-    # Invoke the LLM with the complete prompt
+    # Stream the LLM response, forwarding each chunk as it arrives
     prompt = "".join(prompt_parts)
-    result = llm.invoke(prompt, agent_name="CodeGenerator")
-    code = _get_text(result)
+    chunks = []
+    generated = 0
+    async for chunk in llm.astream(prompt, agent_name="CodeGenerator"):
+        text = extract_text(chunk)
+        if not text:
+            continue
+        chunks.append(text)
+        generated += len(text)
+        if ctx is not None:
+            await ctx.report_progress(generated, message=text)
+    code = "".join(chunks)
     return code
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    run_stdio(mcp)
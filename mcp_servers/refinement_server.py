@@ -3,72 +3,87 @@
 """
 MCP server for code planning, review, and refinement.
 
-This server provides three tools:
+This server provides four tools:
 1. generate_plan: Creates a high-level implementation plan
 2. review_code: Reviews generated code and tests for issues
-3. refine_code: Improves code based on review feedback
+3. review_code_verdict: Same review, returned as an ok flag plus feedback
+4. refine_code: Improves code based on review feedback
 """
 
 from mcp.server.fastmcp import FastMCP
-import sys
-from pathlib import Path
-from typing import Tuple, Optional
-
-# Ensure project root is on sys.path so we can import model_tracker
-ROOT_DIR = Path(__file__).resolve().parents[1]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
-
-from model_tracker import TrackingChatGoogleGenerativeAI, _extract_text  # type: ignore
+import hashlib
+import textwrap
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+# Works both as a script (python mcp_servers/<server>.py) and as a module
+try:
+    from ._common import aget_llm, extract_text, run_stdio
+except ImportError:
+    from _common import aget_llm, extract_text, run_stdio  # type: ignore
 
 # Initialize the MCP server
 mcp = FastMCP("RefinementAgent")
 
-# Lazy-initialized LLM instance (created on first use)
-_llm = None
+# Marker the reviewer includes when code and tests are acceptable
+OK_MARKER = "OK_TO_USE"
 
+# Recent review verdicts keyed on a hash of (app_code, tests), so retries with
+# unchanged code skip the review call. Entries expire after _VERDICT_TTL seconds.
+_VERDICT_TTL = 600.0
+_VERDICT_CACHE_SIZE = 64
+_verdict_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
-def _get_text(result) -> str:
+# Instructions for generate_plan
+_PLAN_INSTRUCTIONS = textwrap.dedent(
     """
-    Extract text from an LLM result object.
-    
-    Wrapper around _extract_text that handles exceptions gracefully.
-    
-    Args:
-        result: Result object from LLM invocation
-        
-    Returns:
-        Extracted text as string
+    You are an expert software architect.
+
+    Given the application description, produce a concise high-level plan for how to implement it
+    in Python. The plan should:
+
+    - Identify the main modules/functions/classes.
+    - Describe how data will flow (e.g., input, processing, output).
+    - Be written as a short bullet list or numbered steps.
+    - Avoid code; focus on structure.
+
+    Return plain text (no markdown code fences).
+    """
+).strip()
+
+# Instructions for review_code
+_REVIEW_INSTRUCTIONS = textwrap.dedent(
     """
-    try:
-        return _extract_text(result)  # type: ignore
-    except Exception:
-        # Fallback to string conversion if extraction fails
-        return str(result)
+    You are performing a lightweight code review for a classroom assignment.
 
+    Given the app code and its tests:
 
-def _get_llm() -> Tuple[Optional[TrackingChatGoogleGenerativeAI], Optional[str]]:
+    - Comment on obvious issues (e.g., missing functions, import mismatches, syntax problems).
+    - Mention whether the tests appear to meaningfully exercise the main logic.
+    - If the code and tests look acceptable for a basic assignment (even if not perfect),
+      include the exact phrase: OK_TO_USE
     """
-    Lazy-initialize the LLM instance.
-    
-    Creates the LLM on first call and reuses it for subsequent calls.
-    
-    Returns:
-        Tuple of (llm_instance, error_message). If successful, error_message is None.
+).strip()
+
+# Instructions for refine_code
+_REFINE_INSTRUCTIONS = textwrap.dedent(
     """
-    global _llm
-    if _llm is not None:
-        return _llm, None
-    try:
-        # Use Gemini 2.5 Flash with temperature=0 for deterministic output
-        _llm = TrackingChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
-        return _llm, None
-    except Exception as e:
-        return None, f"LLM initialization failed: {e}"
+    You are a Python engineer improving an existing script.
+
+    Given the current app code and textual feedback, produce an improved version
+    of the app code.
+
+    Requirements:
+    - Keep the overall structure similar, but fix obvious issues.
+    - Maintain the same public functions where possible so tests continue to work.
+    - Return ONLY the updated Python source code (no explanations or Markdown).
+    """
+).strip()
 
 
 @mcp.tool()
-def generate_plan(description: str) -> str:
+async def generate_plan(description: str) -> str:
     """
     Generate a high-level implementation plan for the application.
     
@@ -83,35 +98,22 @@ def generate_plan(description: str) -> str:
     Returns:
         High-level plan as plain text (no markdown)
     """
-    llm, err = _get_llm()
+    llm, err = await aget_llm()
     if err or llm is None:
         return f"ERROR: {err}"
 
-    instructions = """
-You are an expert software architect.
-
-Given the application description, produce a concise high-level plan for how to implement it
-in Python. The plan should:
-
-- Identify the main modules/functions/classes.
-- Describe how data will flow (e.g., input, processing, output).
-- Be written as a short bullet list or numbered steps.
-- Avoid code; focus on structure.
-
-Return plain text (no markdown code fences).
-"""
-    prompt = f"""{instructions.strip()}
+    prompt = f"""{_PLAN_INSTRUCTIONS}
 
 Application Description:
 {description.strip()}
 """
-    result = llm.invoke(prompt)
-    plan = _get_text(result)
+    result = await llm.ainvoke(prompt)
+    plan = extract_text(result)
     return plan
 
 
 @mcp.tool()
-def review_code(app_code: str, tests: str) -> str:
+async def review_code(app_code: str, tests: str) -> str:
     """
     Review generated code and tests for issues.
     
@@ -129,21 +131,11 @@ def review_code(app_code: str, tests: str) -> str:
     Returns:
         Review feedback as text (includes "OK_TO_USE" if acceptable)
     """
-    llm, err = _get_llm()
+    llm, err = await aget_llm()
     if err or llm is None:
         return f"ERROR: {err}"
 
-    instructions = """
-You are performing a lightweight code review for a classroom assignment.
-
-Given the app code and its tests:
-
-- Comment on obvious issues (e.g., missing functions, import mismatches, syntax problems).
-- Mention whether the tests appear to meaningfully exercise the main logic.
-- If the code and tests look acceptable for a basic assignment (even if not perfect),
-  include the exact phrase: OK_TO_USE
-"""
-    prompt = f"""{instructions.strip()}
+    prompt = f"""{_REVIEW_INSTRUCTIONS}
 
 APP CODE:
 {app_code}
@@ -151,13 +143,13 @@ APP CODE:
 TEST CODE:
 {tests}
 """
-    result = llm.invoke(prompt)
-    feedback = _get_text(result)
+    result = await llm.ainvoke(prompt)
+    feedback = extract_text(result)
     return feedback
 
 
 @mcp.tool()
-def refine_code(app_code: str, feedback: str) -> str:
+async def refine_code(app_code: str, feedback: str) -> str:
     """
     Refine application code based on review feedback.
     
@@ -173,22 +165,11 @@ def refine_code(app_code: str, feedback: str) -> str:
     Returns:
         Refined Python source code as a string
     """
-    llm, err = _get_llm()
+    llm, err = await aget_llm()
     if err or llm is None:
         return f"ERROR: {err}"
 
-    instructions = """
-You are a Python engineer improving an existing script.
-
-Given the current app code and textual feedback, produce an improved version
-of the app code.
-
-Requirements:
-- Keep the overall structure similar, but fix obvious issues.
-- Maintain the same public functions where possible so tests continue to work.
-- Return ONLY the updated Python source code (no explanations or Markdown).
-"""
-    prompt = f"""{instructions.strip()}
+    prompt = f"""{_REFINE_INSTRUCTIONS}
 
 CURRENT APP CODE:
 {app_code}
@@ -196,10 +177,50 @@ CURRENT APP CODE:
 FEEDBACK:
 {feedback}
 """
-    result = llm.invoke(prompt, agent_name="RefinementAgent")
-    refined_code = _get_text(result)
+    result = await llm.ainvoke(prompt, agent_name="RefinementAgent")
+    refined_code = extract_text(result)
     return refined_code
 
 
+@mcp.tool()
+async def review_code_verdict(app_code: str, tests: str) -> Dict[str, Any]:
+    """
+    Review generated code and tests and return a structured verdict.
+    
+    Wraps review_code so callers get a boolean instead of scanning the
+    feedback for the OK_TO_USE marker. Verdicts for identical code/tests
+    pairs are reused for a short time without calling the LLM again.
+    
+    Args:
+        app_code: The generated application code
+        tests: The generated test code
+        
+    Returns:
+        Dictionary with "ok" (True if the code is acceptable) and "feedback"
+        (the full review text)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(app_code.encode())
+    digest.update(b"\0")
+    digest.update(tests.encode())
+    key = digest.hexdigest()
+
+    cached = _verdict_cache.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _VERDICT_TTL:
+        _verdict_cache.move_to_end(key)
+        return cached[1]
+
+    feedback = await review_code(app_code, tests)
+    verdict = {"ok": OK_MARKER in feedback, "feedback": feedback}
+
+    # Errors are not cached so the next attempt retries the review
+    if not feedback.startswith("ERROR:"):
+        _verdict_cache[key] = (time.monotonic(), verdict)
+        _verdict_cache.move_to_end(key)
+        while len(_verdict_cache) > _VERDICT_CACHE_SIZE:
+            _verdict_cache.popitem(last=False)
+    return verdict
+
+
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    run_stdio(mcp)
@@ -7,87 +7,20 @@ The tests focus on pure business logic functions and avoid GUI dependencies.
 """
 
 from mcp.server.fastmcp import FastMCP
-import sys
-from pathlib import Path
-from typing import Tuple, Optional
+import textwrap
 
-# Ensure project root is on sys.path so we can import model_tracker
-ROOT_DIR = Path(__file__).resolve().parents[1]
-if str(ROOT_DIR) not in sys.path:
-    sys.path.insert(0, str(ROOT_DIR))
-
-from model_tracker import TrackingChatGoogleGenerativeAI, _extract_text  # type: ignore
+# Works both as a script (python mcp_servers/<server>.py) and as a module
+try:
+    from ._common import aget_llm, extract_text, run_stdio
+except ImportError:
+    from _common import aget_llm, extract_text, run_stdio  # type: ignore
 
 # Initialize the MCP server
 mcp = FastMCP("TestGenerator")
 
-# Lazy-initialized LLM instance (created on first use)
-_llm = None
-
-
-def _get_text(result) -> str:
-    """
-    Extract text from an LLM result object.
-    
-    Wrapper around _extract_text that handles exceptions gracefully.
-    
-    Args:
-        result: Result object from LLM invocation
-        
-    Returns:
-        Extracted text as string
-    """
-    try:
-        return _extract_text(result)  # type: ignore
-    except Exception:
-        # Fallback to string conversion if extraction fails
-        return str(result)
-
-
-def _get_llm() -> Tuple[Optional[TrackingChatGoogleGenerativeAI], Optional[str]]:
-    """
-    Lazy-initialize the LLM instance.
-    
-    Creates the LLM on first call and reuses it for subsequent calls.
-    
-    Returns:
-        Tuple of (llm_instance, error_message). If successful, error_message is None.
-    """
-    global _llm
-    if _llm is not None:
-        return _llm, None
-    try:
-        # Use Gemini 2.5 Flash with temperature=0 for deterministic output
-        _llm = TrackingChatGoogleGenerativeAI(model="gemini-2.5-flash", temperature=0)
-        return _llm, None
-    except Exception as e:
-        return None, f"LLM initialization failed: {e}"
-
-
-@mcp.tool()
-def generate_tests(app_code: str, description: str) -> str:
+# Instructions that open every test generation prompt
+_TEST_INSTRUCTIONS = textwrap.dedent(
     """
-    Generate a comprehensive pytest test suite for the application.
-    
-    Creates test code that:
-    - Tests pure business logic functions (no GUI)
-    - Provides at least 10 distinct test cases
-    - Covers core functionality, edge cases, and error handling
-    - Returns only valid Python code (no markdown or explanations)
-    
-    Args:
-        app_code: The application code to test
-        description: Original application description (for context)
-        
-    Returns:
-        Complete pytest test file as Python source code
-    """
-    llm, err = _get_llm()
-    if err or llm is None:
-        return f"ERROR: {err}"
-
-    # Detailed instructions for generating clean, valid test code
-    instructions = """
     You are an expert Python testing engineer.
 
     Your job is to generate a COMPLETE, VALID pytest test file.
@@ -122,8 +55,32 @@ def generate_tests(app_code: str, description: str) -> str:
 
     If any part of the app code appears dynamic or GUI-based, extract and test ONLY pure logic functions.
     """
+).strip()
+
+
+@mcp.tool()
+async def generate_tests(app_code: str, description: str) -> str:
+    """
+    Generate a comprehensive pytest test suite for the application.
+    
+    Creates test code that:
+    - Tests pure business logic functions (no GUI)
+    - Provides at least 10 distinct test cases
+    - Covers core functionality, edge cases, and error handling
+    - Returns only valid Python code (no markdown or explanations)
+    
+    Args:
+        app_code: The application code to test
+        description: Original application description (for context)
+        
+    Returns:
+        Complete pytest test file as Python source code
+    """
+    llm, err = await aget_llm()
+    if err or llm is None:
+        return f"ERROR: {err}"
 
-    prompt = f"""{instructions.strip()}
+    prompt = f"""{_TEST_INSTRUCTIONS}
 
 Application Description:
 {description.strip()}
@@ -131,10 +88,10 @@ Application Description:
 Application Code:
 {app_code}
 """
-    result = llm.invoke(prompt, agent_name="TestGenerator")
-    tests_code = _get_text(result)
+    result = await llm.ainvoke(prompt, agent_name="TestGenerator")
+    tests_code = extract_text(result)
     return tests_code
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
+    run_stdio(mcp)
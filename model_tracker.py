@@ -4,16 +4,41 @@ Model usage tracking module.
 
 This module provides a wrapper around LangChain's ChatGoogleGenerativeAI that
 automatically tracks API calls and token usage per agent/model combination.
-Usage statistics are persisted to a JSON file for reporting purposes.
+Usage statistics are accumulated in memory and periodically flushed to a JSON
+file for reporting purposes.
+
+LangChain is imported lazily when the first LLM client is created, so
+importing this module (e.g. at MCP server startup) stays cheap.
 """
 
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
 import json
 import os
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+from disk_cache import DiskLRUCache, replace_file
+
+# orjson is optional; the usage file falls back to the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Inter-process file locking: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 # Base dir (project root)
 BASE_DIR = Path(__file__).resolve().parent
@@ -25,6 +50,32 @@ load_dotenv(BASE_DIR / ".env", override=False)
 # File where model usage is aggregated across processes
 # Format: {agent_name: {model_name: {"numApiCalls": int, "totalTokens": int}}}
 _USAGE_FILE = BASE_DIR / "model_usage.json"
+# Lock file guarding the read-merge-write of _USAGE_FILE across processes
+_USAGE_LOCK_FILE = BASE_DIR / ".model_usage.lock"
+
+# Seconds to wait after a recorded call before flushing usage to disk
+_FLUSH_INTERVAL = 2.0
+
+# Usage recorded by this process that has not been written to _USAGE_FILE yet.
+# Only deltas are kept here: several MCP server processes share the file, so
+# each flush merges into the current file contents instead of overwriting them.
+_pending_usage: Dict[str, Dict[str, Dict[str, int]]] = {}
+_pending_lock = threading.Lock()
+
+# When set, every update is flushed right away instead of after the debounce
+# (see set_immediate_usage_flush)
+_flush_immediately = False
+# Serializes the read-merge-write of a flush within this process (the file
+# lock in _usage_file_lock serializes it across processes)
+_flush_lock = threading.Lock()
+_flush_timer: Optional[threading.Timer] = None
+
+# Response cache for deterministic (temperature=0) calls, keyed on a hash of
+# agent, model and prompt. Entries are kept on disk as well, so they survive
+# restarts and are shared by the separate MCP server processes.
+# Set LLM_RESPONSE_CACHE=0 to disable.
+_RESPONSE_CACHE_ENABLED = os.getenv("LLM_RESPONSE_CACHE", "1") != "0"
+_response_cache = DiskLRUCache(BASE_DIR / ".llm_cache", max_size=128)
 
 
 def _load_usage() -> Dict[str, Dict[str, int]]:
@@ -37,6 +88,8 @@ def _load_usage() -> Dict[str, Dict[str, int]]:
     """
     if _USAGE_FILE.exists():
         try:
+            if orjson is not None:
+                return orjson.loads(_USAGE_FILE.read_bytes())
             return json.loads(_USAGE_FILE.read_text())
         except Exception:
             # If file is corrupted, return empty dict and let it be overwritten
@@ -48,10 +101,54 @@ def _save_usage(data: Dict[str, Dict[str, int]]) -> None:
     """
     Save usage statistics to the JSON file.
     
+    The data is written to a temporary file in the same directory and then
+    renamed over the usage file, so readers never see a partial write.
+    
     Args:
         data: Dictionary containing usage statistics to persist
     """
-    _USAGE_FILE.write_text(json.dumps(data, indent=2))
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode()
+    fd, tmp_path = tempfile.mkstemp(dir=BASE_DIR, prefix=".model_usage.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        replace_file(tmp_path, _USAGE_FILE)
+    except BaseException:
+        # Don't leave stray temp files behind if the write fails
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+@contextlib.contextmanager
+def _usage_file_lock() -> Iterator[None]:
+    """
+    Hold an exclusive inter-process lock on the usage file.
+    
+    The orchestrator and every stdio MCP server process flush into the same
+    usage file; without the lock two flushes could both read the old
+    contents and the later write would drop the other's counts.
+    
+    Yields:
+        None, while the lock is held
+    """
+    with open(_USAGE_LOCK_FILE, "a+b") as f:
+        if fcntl is not None:
+            # Released when the file is closed
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield
+            return
+        # msvcrt locks a byte range; LK_LOCK retries for about 10 seconds
+        # before raising OSError
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
 
 
 def _estimate_tokens(text: str) -> int:
@@ -71,6 +168,24 @@ def _estimate_tokens(text: str) -> int:
     return max(len(words), 1)
 
 
+def _count_tokens(result: Any, text: str) -> int:
+    """
+    Token count for an LLM response.
+    
+    Uses the provider-reported usage_metadata["total_tokens"] (prompt plus
+    completion) when present, and falls back to _estimate_tokens otherwise.
+    
+    Args:
+        result: The result object (or stream chunk) from an LLM invocation
+        text: Text extracted from the result, used for the fallback estimate
+        
+    Returns:
+        Token count (at least 1)
+    """
+    usage = getattr(result, "usage_metadata", None) or {}
+    return usage.get("total_tokens") or _estimate_tokens(text)
+
+
 def _extract_text(result: Any) -> str:
     """
     Try to extract a text string from a LangChain AIMessage or any model response.
@@ -80,68 +195,187 @@ def _extract_text(result: Any) -> str:
     - List of content parts (may contain dicts with "text" keys)
     - Other object types (converted to string)
     
+    Never raises: if extraction fails, the result is converted with str().
+    
     Args:
         result: The result object from an LLM invocation
         
     Returns:
         Extracted text as a string
     """
-    content = getattr(result, "content", None)
-    if isinstance(content, str):
-        return content
-    if isinstance(content, list):
-        # Handle multi-part content (e.g., text + images)
-        parts = []
-        for part in content:
-            if isinstance(part, dict):
-                if "text" in part:
-                    parts.append(part["text"])
-            else:
-                parts.append(str(part))
-        return "\n".join(parts)
-    if content is not None:
-        return str(content)
-    return str(result)
+    try:
+        content = getattr(result, "content", None)
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            # Handle multi-part content (e.g., text + images); dict parts
+            # without a "text" key (such as images) are skipped
+            return "\n".join(
+                part["text"] if isinstance(part, dict) else str(part)
+                for part in content
+                if not isinstance(part, dict) or "text" in part
+            )
+        if content is not None:
+            return str(content)
+        return str(result)
+    except Exception:
+        # Fallback to string conversion if extraction fails
+        return str(result)
+
+
+def _record_usage(agent_name: str, model_name: str, num_tokens: int) -> None:
+    """
+    Add one call to the in-memory pending counters.
+    
+    No disk I/O happens here. Unless usage is flushed immediately (see
+    set_immediate_usage_flush), a background timer flushes the counters to
+    the usage file shortly afterwards.
+    
+    Args:
+        agent_name: Name of the agent making the call (e.g., "CodeGenerator")
+        model_name: Name of the model being used (e.g., "gemini-2.5-flash")
+        num_tokens: Number of tokens used in this call
+    """
+    global _flush_timer
+    with _pending_lock:
+        # Get or create model stats for this agent
+        model_stats = _pending_usage.setdefault(agent_name, {}).setdefault(
+            model_name, {"numApiCalls": 0, "totalTokens": 0}
+        )
+        model_stats["numApiCalls"] += 1
+        model_stats["totalTokens"] += int(num_tokens)
+
+        # Schedule a debounced flush if one is not already pending
+        if _flush_timer is None and not _flush_immediately:
+            _flush_timer = threading.Timer(_FLUSH_INTERVAL, _flush_usage)
+            _flush_timer.daemon = True
+            _flush_timer.start()
 
 
 def _update_usage(agent_name: str, model_name: str, num_tokens: int) -> None:
     """
     Update usage statistics for a specific agent and model.
     
-    Increments the API call count and adds to the total token count.
-    This function is thread-safe at the file level (though not perfect for
-    concurrent writes, it's sufficient for this use case).
+    Records the call with _record_usage and, in immediate mode, writes it to
+    the usage file before returning.
     
     Args:
         agent_name: Name of the agent making the call (e.g., "CodeGenerator")
         model_name: Name of the model being used (e.g., "gemini-2.5-flash")
         num_tokens: Number of tokens used in this call
     """
-    usage = _load_usage()
+    _record_usage(agent_name, model_name, num_tokens)
+    if _flush_immediately:
+        _flush_usage()
 
-    # Initialize agent entry if it doesn't exist
-    if agent_name not in usage:
-        usage[agent_name] = {}
 
-    # Get or create model stats for this agent
-    model_stats = usage[agent_name].get(model_name, {"numApiCalls": 0, "totalTokens": 0})
-    model_stats["numApiCalls"] += 1
-    model_stats["totalTokens"] += int(num_tokens)
+async def _aupdate_usage(agent_name: str, model_name: str, num_tokens: int) -> None:
+    """
+    Asynchronous _update_usage; an immediate flush runs in a worker thread.
+    
+    The flush is still awaited, so the usage is on disk before the calling
+    tool returns its result, but the file I/O does not block the event loop.
+    
+    Args:
+        agent_name: Name of the agent making the call (e.g., "CodeGenerator")
+        model_name: Name of the model being used (e.g., "gemini-2.5-flash")
+        num_tokens: Number of tokens used in this call
+    """
+    _record_usage(agent_name, model_name, num_tokens)
+    if _flush_immediately:
+        await asyncio.to_thread(_flush_usage)
+
+
+def set_immediate_usage_flush(enabled: bool = True) -> None:
+    """
+    Write usage to the usage file on every update instead of debouncing.
+    
+    Used by MCP servers running as stdio subprocesses: the orchestrator reads
+    the usage file as soon as the last tool call returns, so a server process
+    must have written its usage by then rather than up to _FLUSH_INTERVAL
+    seconds later.
+    
+    Args:
+        enabled: Whether to flush on every update
+    """
+    global _flush_immediately
+    _flush_immediately = enabled
+
+
+def _flush_usage() -> None:
+    """
+    Merge pending usage counters into the usage file.
+    
+    Called by the debounce timer, at interpreter exit, and before usage is
+    read back. Does nothing if no calls were recorded since the last flush.
+    """
+    global _flush_timer
+    with _pending_lock:
+        pending = dict(_pending_usage)
+        _pending_usage.clear()
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+    if not pending:
+        return
+
+    with _flush_lock, _usage_file_lock():
+        usage = _load_usage()
+        for agent_name, models in pending.items():
+            agent_usage = usage.setdefault(agent_name, {})
+            for model_name, delta in models.items():
+                model_stats = agent_usage.get(model_name, {"numApiCalls": 0, "totalTokens": 0})
+                model_stats["numApiCalls"] += delta["numApiCalls"]
+                model_stats["totalTokens"] += delta["totalTokens"]
+                agent_usage[model_name] = model_stats
+        _save_usage(usage)
+
 
-    # Update and persist
-    usage[agent_name][model_name] = model_stats
-    _save_usage(usage)
+# Make sure counters recorded late in the process still reach the file
+atexit.register(_flush_usage)
 
 
-class TrackingChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
+def _as_message(text: Optional[str], chunk: bool = False) -> Any:
     """
-    Subclass of ChatGoogleGenerativeAI that tracks usage stats and handles API key.
+    Wrap cached response text as a LangChain message.
+    
+    Args:
+        text: Cached response text, or None on a cache miss
+        chunk: Return an AIMessageChunk (for streams) instead of an AIMessage
+        
+    Returns:
+        The message, or None if text is None
+    """
+    if text is None:
+        return None
+    from langchain_core.messages import AIMessage, AIMessageChunk
+
+    return AIMessageChunk(content=text) if chunk else AIMessage(content=text)
+
+
+def _chunk_tokens(chunk: Any) -> int:
+    """Token delta reported in a stream chunk's usage_metadata (0 if absent)."""
+    usage = getattr(chunk, "usage_metadata", None) or {}
+    return usage.get("total_tokens") or 0
+
+
+class TrackingChatGoogleGenerativeAI:
+    """
+    Wrapper around ChatGoogleGenerativeAI that tracks usage stats and handles API key.
+    
+    The wrapped client is created in __init__, which is also where
+    langchain_google_genai is first imported. Attributes not defined here
+    are forwarded to the wrapped client.
     
     This wrapper automatically tracks all LLM invocations, recording:
     - Number of API calls per agent/model
     - Total tokens used per agent/model
     
     The agent_name parameter allows different parts of the system to be tracked separately.
+    
+    Plain-prompt calls made at temperature 0 are served from a response cache
+    when the same agent has already sent the same prompt to the same model.
+    Cache hits do not count as API calls.
     """
 
     def __init__(self, *args, **kwargs):
@@ -159,46 +393,286 @@ class TrackingChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
         )
         if google_key:
             kwargs["google_api_key"] = google_key
-        # If no key, super() will raise a clear error which we catch in the tools
-        super().__init__(*args, **kwargs)
+        # Deferred import: LangChain is only loaded once a client is needed
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        # If no key, this will raise a clear error which we catch in the tools
+        self._llm = ChatGoogleGenerativeAI(*args, **kwargs)
+
+    @property
+    def model(self) -> str:
+        """Name of the wrapped Gemini model."""
+        return self._llm.model
+
+    @property
+    def temperature(self) -> Optional[float]:
+        """Sampling temperature of the wrapped model."""
+        return self._llm.temperature
 
-    def invoke(self, *args, agent_name="UnknownAgent",  **kwargs):
+    def __getattr__(self, name: str) -> Any:
+        """Forward any other attribute access to the wrapped client."""
+        if name == "_llm":
+            # Not set yet (construction failed); avoid recursing forever
+            raise AttributeError(name)
+        return getattr(self._llm, name)
+
+    def _response_cache_key(self, agent_name: str, args: tuple, kwargs: dict) -> Optional[str]:
+        """
+        Compute the response cache key for a call, if the call is cacheable.
+        
+        Only deterministic calls with a single string prompt and no extra
+        options are cached.
+        
+        Args:
+            agent_name: Name of the agent making the call
+            args: Positional arguments of the call
+            kwargs: Keyword arguments of the call
+            
+        Returns:
+            Hex digest identifying (agent, model, prompt), or None if not cacheable
+        """
+        if not _RESPONSE_CACHE_ENABLED or self.temperature != 0:
+            return None
+        if kwargs or len(args) != 1 or not isinstance(args[0], str):
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (agent_name, self.model, args[0]):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _cached_message(self, cache_key: Optional[str], chunk: bool = False) -> Any:
+        """
+        Look up a cached response and wrap it as a LangChain message.
+        
+        Args:
+            cache_key: Key from _response_cache_key, or None if not cacheable
+            chunk: Return an AIMessageChunk (for streams) instead of an AIMessage
+            
+        Returns:
+            The cached message, or None on a miss
+        """
+        if cache_key is None:
+            return None
+        return _as_message(_response_cache.get(cache_key), chunk)
+
+    async def _acached_message(self, cache_key: Optional[str], chunk: bool = False) -> Any:
+        """Asynchronous _cached_message; the disk lookup runs in a worker thread."""
+        if cache_key is None:
+            return None
+        return _as_message(await asyncio.to_thread(_response_cache.get, cache_key), chunk)
+
+    @staticmethod
+    def _stream_usage(parts: list, reported_tokens: int) -> Tuple[str, int]:
+        """
+        Compute the usage of a finished (or abandoned) stream.
+        
+        Args:
+            parts: Text of each chunk received so far
+            reported_tokens: Sum of the chunks' usage_metadata token deltas
+            
+        Returns:
+            Tuple of (accumulated response text, token count)
+        """
+        text = "".join(parts)
+        return text, reported_tokens or _estimate_tokens(text)
+
+    def invoke(self, *args, agent_name="UnknownAgent", **kwargs):
         """
         Synchronous invocation with usage tracking.
         
         Args:
-            *args: Arguments passed to the parent invoke method
+            *args: Arguments passed to the wrapped client's invoke method
             agent_name: Name of the agent making this call (for tracking)
-            **kwargs: Keyword arguments passed to the parent invoke method
+            **kwargs: Keyword arguments passed to the wrapped client's invoke method
             
         Returns:
             The result from the LLM invocation
         """
-        result = super().invoke(*args, **kwargs)
+        cache_key = self._response_cache_key(agent_name, args, kwargs)
+        cached = self._cached_message(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._llm.invoke(*args, **kwargs)
         text = _extract_text(result)
-        tokens = _estimate_tokens(text)
+        tokens = _count_tokens(result, text)
         _update_usage(agent_name, self.model, tokens)
+        if cache_key is not None and text:
+            _response_cache.put(cache_key, text)
         return result
 
     async def ainvoke(self, *args, agent_name="UnknownAgent", **kwargs):
         """
         Asynchronous invocation with usage tracking.
         
+        Response cache reads and writes run in a worker thread so they never
+        block the event loop.
+        
         Args:
-            *args: Arguments passed to the parent ainvoke method
+            *args: Arguments passed to the wrapped client's ainvoke method
             agent_name: Name of the agent making this call (for tracking)
-            **kwargs: Keyword arguments passed to the parent ainvoke method
+            **kwargs: Keyword arguments passed to the wrapped client's ainvoke method
             
         Returns:
             The result from the LLM invocation
         """
-        result = await super().ainvoke(*args, **kwargs)
+        cache_key = self._response_cache_key(agent_name, args, kwargs)
+        cached = await self._acached_message(cache_key)
+        if cached is not None:
+            return cached
+
+        result = await self._llm.ainvoke(*args, **kwargs)
         text = _extract_text(result)
-        tokens = _estimate_tokens(text)
-        _update_usage(agent_name, self.model, tokens)
+        tokens = _count_tokens(result, text)
+        await _aupdate_usage(agent_name, self.model, tokens)
+        if cache_key is not None and text:
+            await asyncio.to_thread(_response_cache.put, cache_key, text)
         return result
 
+    def stream(self, *args, agent_name="UnknownAgent", **kwargs):
+        """
+        Synchronous streaming with usage tracking.
+        
+        Yields response chunks as they arrive. Usage is recorded once the
+        stream ends (or is closed early) based on the accumulated text. A
+        cached response is yielded as a single chunk.
+        
+        Args:
+            *args: Arguments passed to the wrapped client's stream method
+            agent_name: Name of the agent making this call (for tracking)
+            **kwargs: Keyword arguments passed to the wrapped client's stream method
+        
+        Yields:
+            Message chunks from the LLM
+        """
+        cache_key = self._response_cache_key(agent_name, args, kwargs)
+        cached = self._cached_message(cache_key, chunk=True)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        # Gemini reports per-chunk usage deltas, so their sum is the call total
+        reported_tokens = 0
+        try:
+            for chunk in self._llm.stream(*args, **kwargs):
+                parts.append(_extract_text(chunk))
+                reported_tokens += _chunk_tokens(chunk)
+                yield chunk
+        finally:
+            text, tokens = self._stream_usage(parts, reported_tokens)
+            _update_usage(agent_name, self.model, tokens)
+        # Only a stream that ran to completion is worth caching
+        if cache_key is not None and text:
+            _response_cache.put(cache_key, text)
+
+    async def astream(self, *args, agent_name="UnknownAgent", **kwargs):
+        """
+        Asynchronous streaming with usage tracking.
+        
+        Behaves like stream(); response cache reads and writes run in a
+        worker thread so they never block the event loop.
+        
+        Args:
+            *args: Arguments passed to the wrapped client's astream method
+            agent_name: Name of the agent making this call (for tracking)
+            **kwargs: Keyword arguments passed to the wrapped client's astream method
+        
+        Yields:
+            Message chunks from the LLM
+        """
+        cache_key = self._response_cache_key(agent_name, args, kwargs)
+        cached = await self._acached_message(cache_key, chunk=True)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        # Gemini reports per-chunk usage deltas, so their sum is the call total
+        reported_tokens = 0
+        try:
+            async for chunk in self._llm.astream(*args, **kwargs):
+                parts.append(_extract_text(chunk))
+                reported_tokens += _chunk_tokens(chunk)
+                yield chunk
+        finally:
+            text, tokens = self._stream_usage(parts, reported_tokens)
+            await _aupdate_usage(agent_name, self.model, tokens)
+        # Only a stream that ran to completion is worth caching
+        if cache_key is not None and text:
+            await asyncio.to_thread(_response_cache.put, cache_key, text)
+
+
+# Serializes client creation so concurrent first calls build only one client
+_shared_llm_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_shared_llm(model: str, temperature: float) -> TrackingChatGoogleGenerativeAI:
+    """Create the client for get_shared_llm (cached per (model, temperature))."""
+    return TrackingChatGoogleGenerativeAI(model=model, temperature=temperature)
+
+
+def get_shared_llm(model: str = "gemini-2.5-flash", temperature: float = 0) -> TrackingChatGoogleGenerativeAI:
+    """
+    Return the process-wide LLM instance for a (model, temperature) pair.
+    
+    All agents hosted in the same process share one client, and with it one
+    set of credentials and one HTTP connection pool. Construction errors are
+    not cached, so a failed initialization is retried on the next call.
+    
+    Args:
+        model: Gemini model name
+        temperature: Sampling temperature
+        
+    Returns:
+        Shared TrackingChatGoogleGenerativeAI instance
+    """
+    with _shared_llm_lock:
+        return _build_shared_llm(model, temperature)
+
+
+async def awarm_up_shared_llm(model: str = "gemini-2.5-flash", temperature: float = 0) -> None:
+    """
+    Create the shared client and connect its async transport to the Gemini API.
+    
+    The tools only use ainvoke/astream, which go through the wrapped client's
+    async_client: a separate grpc_asyncio client that is created lazily on the
+    first async call and bound to the event loop it runs on. This coroutine
+    must therefore be scheduled on the loop that serves the tools. It builds
+    the client in a worker thread (importing LangChain on the way), then sends
+    an async token-count request so the async channel and its TLS/auth
+    handshake are set up before the first real request. Counting tokens is
+    not billed and is not recorded in the usage stats. Failures are ignored;
+    the tools report them on first use.
+    
+    Args:
+        model: Gemini model name
+        temperature: Sampling temperature
+    """
+    try:
+        llm = await asyncio.to_thread(get_shared_llm, model=model, temperature=temperature)
+        model_name = llm.model if llm.model.startswith("models/") else f"models/{llm.model}"
+        await llm.async_client.count_tokens(
+            model=model_name,
+            contents=[{"role": "user", "parts": [{"text": "ping"}]}],
+        )
+    except Exception:
+        pass
+
 
 def get_model_usage() -> Dict[str, Dict[str, int]]:
-    """Public accessor to model usage JSON."""
+    """Public accessor to model usage JSON (flushes this process's pending usage first)."""
+    _flush_usage()
     return _load_usage()
+
+
+async def aget_model_usage() -> Dict[str, Dict[str, int]]:
+    """
+    Async variant of get_model_usage for use inside the event loop.
+    
+    The flush and file read run in a worker thread, so concurrent pipeline
+    calls keep making progress while the usage file is written.
+    """
+    return await asyncio.to_thread(get_model_usage)
@@ -0,0 +1,251 @@
+"""
+Persistent MCP client sessions for the orchestrator.
+
+MCPHost keeps one initialized ClientSession per MCP server script, so a
+pipeline that calls the same server several times pays for the initialize
+handshake and tool discovery only once.
+
+Servers from this repository are imported and served in-process over an
+in-memory transport, which avoids interpreter startup and module imports on
+every connection. A script that cannot be imported falls back to running as
+a stdio subprocess.
+"""
+
+import asyncio
+import contextlib
+import importlib
+import logging
+import sys
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from mcp import ClientSession, StdioServerParameters, types
+from mcp.client.stdio import stdio_client
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+logger = logging.getLogger(__name__)
+
+# Package the in-process servers are imported from
+SERVER_PACKAGE = "mcp_servers"
+
+
+def _import_server(server_script: Path) -> Optional[FastMCP]:
+    """
+    Import a server script as a module of SERVER_PACKAGE.
+    
+    Args:
+        server_script: Path to the Python script that implements the MCP server
+    
+    Returns:
+        The module's FastMCP instance (its `mcp` attribute), or None if the
+        script is not an importable server
+    """
+    try:
+        module = importlib.import_module(f"{SERVER_PACKAGE}.{server_script.stem}")
+    except ImportError:
+        return None
+    server = getattr(module, "mcp", None)
+    return server if isinstance(server, FastMCP) else None
+
+
+@contextlib.asynccontextmanager
+async def _open_session(server_script: Path) -> AsyncIterator[ClientSession]:
+    """
+    Open an initialized session to a server, in-process when possible.
+    
+    Args:
+        server_script: Path to the Python script that implements the MCP server
+    
+    Yields:
+        An initialized ClientSession
+    """
+    # Importing runs module code, so keep it off the loop
+    server = await asyncio.to_thread(_import_server, server_script)
+    if server is not None:
+        # The servers only warm up the LLM client themselves when run as a
+        # script; in-process, warm it up on this (the serving) loop
+        importlib.import_module(f"{SERVER_PACKAGE}._common").start_warm_up()
+
+        # Served on this event loop over memory streams; already initialized
+        async with create_connected_server_and_client_session(server) as session:
+            yield session
+        return
+
+    # Fall back to running the script as a Python subprocess over stdio, with
+    # the interpreter running the orchestrator (so it sees the same packages)
+    server_params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(server_script)],
+    )
+    async with stdio_client(server_params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+class MCPHost:
+    """
+    Pool of long-lived MCP sessions, keyed by server script.
+    
+    Each server connection is owned by its own background task, which enters
+    the transport and session contexts and keeps them open until
+    aclose() is called. (The transport's task groups must be entered and
+    exited by the same task, so connections cannot simply be pushed onto an
+    AsyncExitStack owned by whichever coroutine happens to connect first.)
+    
+    Tools are called directly on the session; their names are listed once
+    per connection so unknown tools are rejected without a round trip.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty host; servers are started on first connect()."""
+        self._sessions: Dict[Path, ClientSession] = {}
+        self._tool_names: Dict[Path, List[str]] = {}
+        self._ready: Dict[Path, "asyncio.Future[None]"] = {}
+        self._runners: Dict[Path, "asyncio.Task[None]"] = {}
+        self._closing: Optional[asyncio.Event] = None
+
+    async def connect(self, server_script: Path) -> None:
+        """
+        Start and initialize a server unless it is already connected.
+        
+        Concurrent calls for the same script share a single connection attempt.
+        The shared attempt is shielded, so cancelling one caller neither
+        cancels the connection nor the other callers waiting on it.
+        
+        Args:
+            server_script: Path to the Python script that implements the MCP server
+        
+        Raises:
+            Exception: Whatever prevented the server from starting or initializing
+        """
+        ready = self._ready.get(server_script)
+        if ready is None:
+            if self._closing is None:
+                self._closing = asyncio.Event()
+            ready = asyncio.get_running_loop().create_future()
+            # Mark a failure as retrieved even if every waiter was cancelled
+            ready.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._ready[server_script] = ready
+            self._runners[server_script] = asyncio.create_task(
+                self._serve(server_script, ready)
+            )
+        await asyncio.shield(ready)
+
+    async def connect_all(self, server_scripts: List[Path]) -> None:
+        """
+        Connect to several servers at once.
+        
+        Every server is started, initialized and has its tools listed in its
+        own task, so startup takes as long as the slowest server rather than
+        the sum of all of them. (Within one server, list_tools must follow
+        initialize, as the protocol requires.)
+        
+        Args:
+            server_scripts: Paths to the Python scripts implementing the servers
+        
+        Raises:
+            Exception: The first error that prevented a server from connecting
+        """
+        await asyncio.gather(*(self.connect(script) for script in server_scripts))
+
+    async def _serve(self, server_script: Path, ready: "asyncio.Future[None]") -> None:
+        """
+        Own one server connection for the lifetime of the host.
+        
+        Connection errors are delivered to connect() callers through `ready`
+        (or logged, if the session drops later), so the task itself only ends
+        with an exception when it is cancelled.
+        
+        Args:
+            server_script: Path to the Python script that implements the MCP server
+            ready: Future resolved once the session is initialized and its tools
+                are listed (or failed with the connection error)
+        """
+        try:
+            async with _open_session(server_script) as session:
+                # Discover the server's tool names once
+                listed = await session.list_tools()
+                self._tool_names[server_script] = [tool.name for tool in listed.tools]
+                self._sessions[server_script] = session
+                ready.set_result(None)
+
+                # Keep the session open until the host is closed
+                await self._closing.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning("MCP session for %s closed unexpectedly", server_script, exc_info=True)
+        finally:
+            # Forget this connection so a later connect() starts a fresh server
+            if self._ready.get(server_script) is ready:
+                del self._ready[server_script]
+            if self._runners.get(server_script) is asyncio.current_task():
+                del self._runners[server_script]
+            self._sessions.pop(server_script, None)
+            self._tool_names.pop(server_script, None)
+
+    def tool_names(self, server_script: Path) -> List[str]:
+        """Names of the tools offered by a connected server."""
+        return list(self._tool_names.get(server_script, []))
+
+    async def call_tool(
+        self,
+        server_script: Path,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> types.CallToolResult:
+        """
+        Call a tool on a connected server.
+        
+        Partial output is requested through MCP progress notifications, which
+        belong to this one request, so concurrent calls on a shared session
+        never receive each other's chunks.
+        
+        Args:
+            server_script: Path to the Python script that implements the MCP server
+            tool_name: Name of the tool to invoke
+            arguments: Dictionary of arguments to pass to the tool
+            on_chunk: Optional callback receiving the message of each progress
+                notification the tool sends
+        
+        Returns:
+            The raw MCP tool result
+        
+        Raises:
+            ValueError: If the server is not connected or has no such tool
+        """
+        session = self._sessions.get(server_script)
+        if session is None or tool_name not in self._tool_names[server_script]:
+            raise ValueError(
+                f"Tool '{tool_name}' not found on server '{server_script}'. "
+                f"Available tools: {self.tool_names(server_script)}"
+            )
+
+        async def _forward_progress(
+            progress: float, total: Optional[float], message: Optional[str]
+        ) -> None:
+            if message:
+                on_chunk(message)
+
+        return await session.call_tool(
+            tool_name,
+            arguments,
+            progress_callback=_forward_progress if on_chunk is not None else None,
+        )
+
+    async def aclose(self) -> None:
+        """Close every session and wait for the server processes to exit."""
+        if self._closing is not None:
+            self._closing.set()
+        await asyncio.gather(*self._runners.values(), return_exceptions=True)
+        self._runners.clear()
+        self._ready.clear()
+        self._closing = None
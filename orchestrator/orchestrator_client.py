@@ -10,82 +10,298 @@ This module coordinates the entire code generation workflow:
 5. Package everything into a ZIP file
 6. Return usage statistics
 
-All MCP servers are invoked as separate processes via stdio communication.
+The MCP servers are served in-process over an in-memory transport (falling
+back to stdio subprocesses if they cannot be imported). All pipeline runs
+share one background event loop and one MCPHost, so each server is
+connected once per process and its session is reused for every tool call.
 """
 
 import asyncio
+import atexit
+import concurrent.futures
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import zipfile
 from pathlib import Path
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Awaitable, Callable, Coroutine, List, Optional, TypeVar, Union
 
-from mcp import ClientSession, StdioServerParameters
-from mcp.client.stdio import stdio_client
-from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import types
 
-from model_tracker import get_model_usage
-from orchestrator.zip_util import create_zip_from_strings
+from disk_cache import DiskLRUCache
+from model_tracker import aget_model_usage
+from orchestrator.mcp_host import MCPHost
+from orchestrator.semantic_cache import get_semantic_cache
+from orchestrator.zip_util import copy_zip, create_zip_from_strings
+
+# Optional: the pipeline loop runs on libuv when uvloop is installed (it is
+# not available on Windows); otherwise the default asyncio loop is used
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Project root directory (parent of orchestrator/)
 BASE_DIR = Path(__file__).resolve().parents[1]
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on MCP tool calls (and therefore LLM requests) in flight at once.
+# Sized so that a full GUI batch of pipelines can each have one call in flight.
+MAX_CONCURRENT_TOOL_CALLS = 8
+
+
+def _load_tool_result(text: str) -> str:
+    """Decode a tool result stored by the tool cache (ValueError if it is not a string)."""
+    result = json.loads(text)
+    if not isinstance(result, str):
+        raise ValueError("cached tool result is not a string")
+    return result
+
+
+# Optional exact-match cache of tool results, keyed by server, tool and
+# arguments. Entries live in memory and as one JSON file each under
+# .mcp_cache, so repeated runs of the same description skip the LLM.
+# Set MCP_CACHE=1 to enable.
+_TOOL_CACHE_ENABLED = os.getenv("MCP_CACHE", "0") == "1"
+_tool_cache = DiskLRUCache(
+    BASE_DIR / ".mcp_cache",
+    max_size=128,
+    dumps=json.dumps,
+    loads=_load_tool_result,
+)
+
+T = TypeVar("T")
+
+# Background event loop shared by every pipeline run in this process, and the
+# MCP host and tool call limiter living on it (see submit(), _get_host() and
+# _get_tool_call_limiter())
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_host: Optional[MCPHost] = None
+_tool_call_limiter: Optional[asyncio.Semaphore] = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the background event loop, starting its thread on first use.
+    
+    Returns:
+        Event loop running forever in a daemon thread
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            # Only this loop uses uvloop; the process-wide policy (and so the
+            # loop Gradio/uvicorn create) is left untouched
+            loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever,
+                name="mcp-pipeline-loop",
+                daemon=True,
+            ).start()
+            _loop = loop
+    return _loop
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+    """
+    Schedule a coroutine on the shared background event loop.
+    
+    Running every pipeline on one long-lived loop lets the MCP sessions opened
+    by one run be reused by all later runs, instead of being torn down with a
+    fresh asyncio.run loop each time.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        Future resolving to the coroutine's result, usable from any thread
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+
+def _get_host() -> MCPHost:
+    """Return the process-wide MCP host (must be called on the background loop)."""
+    global _host
+    if _host is None:
+        _host = MCPHost()
+    return _host
+
+
+def _get_tool_call_limiter() -> asyncio.Semaphore:
+    """
+    Return the shared tool call semaphore (must be called on the background loop).
+    
+    Stages that do not depend on each other may be awaited together with
+    asyncio.gather; the semaphore keeps the number of simultaneous Gemini
+    requests within MAX_CONCURRENT_TOOL_CALLS.
+    
+    Returns:
+        Semaphore shared by every pipeline run on the background loop
+    """
+    global _tool_call_limiter
+    if _tool_call_limiter is None:
+        _tool_call_limiter = asyncio.Semaphore(MAX_CONCURRENT_TOOL_CALLS)
+    return _tool_call_limiter
+
+
+def _shutdown() -> None:
+    """Close the shared MCP sessions and stop the background loop at exit."""
+    if _loop is None:
+        return
+    if _host is not None:
+        try:
+            submit(_host.aclose()).result(timeout=5)
+        except Exception:
+            # Exiting anyway; the daemon thread dies with the process
+            pass
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+atexit.register(_shutdown)
+
+
+def _tool_cache_key(server_script: Path, tool_name: str, arguments: Dict[str, Any]) -> str:
+    """
+    Build the cache key for one tool call.
+    
+    Args:
+        server_script: Path to the Python script that implements the MCP server
+        tool_name: Name of the tool being invoked
+        arguments: Arguments passed to the tool
+        
+    Returns:
+        Hex SHA-256 digest of the server name, tool name and canonical arguments
+    """
+    canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    payload = f"{server_script.name}|{tool_name}|{canonical}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_error_result(result: str) -> bool:
+    """
+    Check whether a tool result reports a server-side error.
+    
+    Servers signal failures in-band with an "ERROR: ..." string, either as the
+    whole result or, for review_code_verdict, as the verdict's feedback.
+    
+    Args:
+        result: Text returned by the tool
+        
+    Returns:
+        True if the result carries an error message
+    """
+    if result.startswith("ERROR:"):
+        return True
+    try:
+        verdict = json.loads(result)
+    except ValueError:
+        return False
+    return isinstance(verdict, dict) and str(verdict.get("feedback", "")).startswith("ERROR:")
+
+
+def _cached_tool_call(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """
+    Serve repeated tool calls from the tool result cache when MCP_CACHE=1.
+    
+    A hit is returned without contacting the server; if the caller asked for
+    streamed output, the cached result is delivered as a single chunk. Error
+    results returned by the servers ("ERROR: ...") are never cached, and
+    since review_code_verdict is cached too, a cached review always leads to
+    the same refine_code arguments and therefore to another cache hit.
+    
+    Args:
+        func: The _call_mcp_tool coroutine function to wrap
+        
+    Returns:
+        Wrapped coroutine function with the same signature
+    """
+
+    @functools.wraps(func)
+    async def wrapper(
+        host: MCPHost,
+        server_script: Path,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        on_chunk: Optional[Callable[[str], None]] = None,
+    ) -> str:
+        if not _TOOL_CACHE_ENABLED:
+            return await func(host, server_script, tool_name, arguments, on_chunk)
+
+        key = _tool_cache_key(server_script, tool_name, arguments)
+        cached = await asyncio.to_thread(_tool_cache.get, key)
+        if cached is not None:
+            if on_chunk is not None:
+                on_chunk(cached)
+            return cached
+
+        result = await func(host, server_script, tool_name, arguments, on_chunk)
+        if not _is_error_result(result):
+            await asyncio.to_thread(_tool_cache.put, key, result)
+        return result
+
+    return wrapper
 
+
+@_cached_tool_call
 async def _call_mcp_tool(
+    host: MCPHost,
     server_script: Path,
     tool_name: str,
     arguments: Dict[str, Any],
-) -> Any:
+    on_chunk: Optional[Callable[[str], None]] = None,
+) -> str:
     """
-    Start an MCP server process and invoke a specific tool.
+    Invoke a specific tool on an MCP server through the host's session pool.
     
-    This function spawns a new Python process running the MCP server script,
-    establishes stdio communication, discovers available tools, and invokes
-    the requested tool with the provided arguments.
+    The server is connected on its first use by this host; later calls reuse
+    the open session and the tool names listed at connect time. At
+    most MAX_CONCURRENT_TOOL_CALLS invocations run at the same time.
     
     Args:
+        host: Session pool owning the server connections
         server_script: Path to the Python script that implements the MCP server
         tool_name: Name of the tool to invoke (must be exposed by the server)
         arguments: Dictionary of arguments to pass to the tool
+        on_chunk: Optional callback receiving partial output the tool streams
+            as progress notifications
         
     Returns:
-        The result returned by the tool
+        The text content of the tool result (tools returning a dict produce
+        its JSON text)
         
     Raises:
         ValueError: If the requested tool is not found on the server
+        RuntimeError: If the tool call itself failed on the server
     """
-    # Configure the server to run as a Python subprocess
-    server_params = StdioServerParameters(
-        command="python3",
-        args=[str(server_script)],
-    )
+    await host.connect(server_script)
 
-    # Connect to the server via stdio (stdin/stdout)
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            # Initialize the MCP session
-            await session.initialize()
-            # Discover all tools exposed by this server
-            tools = await load_mcp_tools(session)
+    # Invoke the tool directly on the session (MCPHost validates the name)
+    async with _get_tool_call_limiter():
+        result = await host.call_tool(server_script, tool_name, arguments, on_chunk)
 
-            # Find the requested tool by name
-            target_tool = None
-            for tool in tools:
-                if tool.name == tool_name:
-                    target_tool = tool
-                    break
+    text = "".join(
+        block.text for block in result.content if isinstance(block, types.TextContent)
+    )
+    if result.isError:
+        raise RuntimeError(f"Tool '{tool_name}' failed: {text}")
+    return text
 
-            # Validate that the tool exists
-            if target_tool is None:
-                available = [t.name for t in tools]
-                raise ValueError(
-                    f"Tool '{tool_name}' not found on server '{server_script}'. "
-                    f"Available tools: {available}"
-                )
 
-            # Invoke the tool asynchronously
-            result = await target_tool.ainvoke(arguments)
-            return result
+def _read_app_code(zip_path: Path) -> str:
+    """Read the application code stored in a generated ZIP."""
+    with zipfile.ZipFile(zip_path) as zf:
+        return zf.read("app.py").decode("utf-8")
 
 
-async def _run_pipeline_async(description: str) -> Tuple[str, Dict[str, Dict[str, int]]]:
+async def _run_pipeline_async(
+    description: str,
+    on_code_chunk: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, Dict[str, Dict[str, int]]]:
     """
     Execute the full code generation pipeline asynchronously.
     
@@ -97,8 +313,13 @@ async def _run_pipeline_async(description: str) -> Tuple[str, Dict[str, Dict[str
     5. Package everything into a ZIP file
     6. Collect and return model usage statistics
     
+    With the optional semantic cache enabled, a description close enough to
+    an earlier one skips steps 1-5 and returns a copy of the earlier ZIP.
+    
     Args:
         description: User-provided description of the desired application
+        on_code_chunk: Optional callback receiving application code chunks
+            as they stream from the code generator
         
     Returns:
         Tuple of (zip_file_path, model_usage_dict)
@@ -108,76 +329,207 @@ async def _run_pipeline_async(description: str) -> Tuple[str, Dict[str, Dict[str
     codegen_server = BASE_DIR / "mcp_servers" / "codegen_server.py"
     testgen_server = BASE_DIR / "mcp_servers" / "testgen_server.py"
 
+    # Sessions are shared with every other pipeline run in this process
+    host = _get_host()
+    semantic_cache = get_semantic_cache()
+
+    async def _find_similar_zip() -> Optional[Path]:
+        if semantic_cache is None:
+            return None
+        try:
+            return await asyncio.to_thread(semantic_cache.lookup, description)
+        except Exception:
+            # The cache is optional: any failure (e.g. the embedding model
+            # cannot be downloaded) counts as a miss rather than failing the run
+            logger.warning("Semantic cache lookup failed", exc_info=True)
+            return None
+
+    # These steps are independent, so they run concurrently: look for a
+    # sufficiently similar earlier description in the optional semantic cache
+    # (SEMANTIC_CACHE=1) while connecting to all three servers (a no-op once
+    # they are connected) with their startup handshakes overlapping
+    cached_zip, _ = await asyncio.gather(
+        _find_similar_zip(),
+        host.connect_all([refinement_server, codegen_server, testgen_server]),
+    )
+    if cached_zip is not None:
+        try:
+            zip_path = await asyncio.to_thread(copy_zip, cached_zip)
+            if on_code_chunk is not None:
+                on_code_chunk(await asyncio.to_thread(_read_app_code, zip_path))
+        except (OSError, KeyError, zipfile.BadZipFile):
+            # An unreadable cached ZIP is treated as a miss
+            logger.warning("Could not reuse cached ZIP %s", cached_zip, exc_info=True)
+        else:
+            return str(zip_path), await aget_model_usage()
+
     # Step 1: Generate a high-level plan for implementation
     plan = await _call_mcp_tool(
+        host,
         refinement_server,
         "generate_plan",
         {"description": description},
     )
-    if not isinstance(plan, str):
-        plan = str(plan)
 
     # Step 2: Generate the actual application code using the plan
     app_code = await _call_mcp_tool(
+        host,
         codegen_server,
         "generate_app_code",
         {"description": description, "plan": plan},
+        on_chunk=on_code_chunk,
     )
-    if not isinstance(app_code, str):
-        app_code = str(app_code)
 
     # Step 3: Generate test code based on the app code
     tests_code = await _call_mcp_tool(
+        host,
         testgen_server,
         "generate_tests",
         {"app_code": app_code, "description": description},
     )
-    if not isinstance(tests_code, str):
-        tests_code = str(tests_code)
 
-    # Step 4: Review the code and tests, then optionally refine
-    feedback = await _call_mcp_tool(
+    # Step 4: Review the code and tests, then optionally refine.
+    # The review reads the generated tests, so it cannot overlap step 3.
+    verdict_text = await _call_mcp_tool(
+        host,
         refinement_server,
-        "review_code",
+        "review_code_verdict",
         {"app_code": app_code, "tests": tests_code},
     )
-    if not isinstance(feedback, str):
-        feedback = str(feedback)
+    # The verdict arrives as the JSON text of the tool's dict result
+    verdict = json.loads(verdict_text)
 
-    # If the review indicates issues (no "OK_TO_USE" marker), refine the code
-    if "OK_TO_USE" not in feedback:
+    # If the review found issues, refine the code using its feedback
+    if not verdict["ok"]:
+        reviewed_code = app_code
         refined_code = await _call_mcp_tool(
+            host,
             refinement_server,
             "refine_code",
-            {"app_code": app_code, "feedback": feedback},
+            {"app_code": app_code, "feedback": verdict["feedback"]},
         )
         # Only use refined code if it's valid and non-empty
-        if isinstance(refined_code, str) and refined_code.strip():
+        if refined_code.strip() and not refined_code.startswith("ERROR:"):
             app_code = refined_code
 
-    # Step 5: Package the generated code into a ZIP file
-    zip_path = create_zip_from_strings(app_code, tests_code, description)
+        # The tests were written against the reviewed code; regenerate them
+        # if refinement actually changed it so they never go out stale
+        if app_code != reviewed_code:
+            tests_code = await _call_mcp_tool(
+                host,
+                testgen_server,
+                "generate_tests",
+                {"app_code": app_code, "description": description},
+            )
+
+    # Step 5: Package the generated code into a ZIP file.
+    # This deliberately waits for the final code instead of writing streamed
+    # chunks into the archive: the review step may replace the streamed draft
+    # with refined code, and the tests are only known at this point.
+    # Compression and the file write run in a worker thread so they never
+    # stall other pipelines sharing the event loop.
+    zip_path = await asyncio.to_thread(
+        create_zip_from_strings, app_code, tests_code, description
+    )
+    # Only index runs whose every step succeeded; a ZIP holding in-band
+    # "ERROR: ..." results would otherwise be served for similar descriptions
+    # long after the cause (e.g. a bad API key) is fixed
+    results = (plan, app_code, tests_code, verdict_text)
+    if semantic_cache is not None and not any(map(_is_error_result, results)):
+        try:
+            await asyncio.to_thread(semantic_cache.add, description, zip_path)
+        except Exception:
+            # The ZIP is already written; failing to index it only costs a
+            # future cache hit, so the run still succeeds
+            logger.warning("Semantic cache update failed", exc_info=True)
 
     # Step 6: Collect usage statistics from all model invocations
-    usage = get_model_usage()
+    usage = await aget_model_usage()
 
     return str(zip_path), usage
 
 
-def run_pipeline(description: str) -> Tuple[str, Dict[str, Dict[str, int]]]:
+def start_pipeline(
+    description: str,
+    on_code_chunk: Optional[Callable[[str], None]] = None,
+) -> "concurrent.futures.Future[Tuple[str, Dict[str, Dict[str, int]]]]":
+    """
+    Non-blocking entry point: start a pipeline run on the background loop.
+    
+    Callers can wait on the returned future, attach done callbacks to it, or
+    cancel it (which cancels the run) without tying up a thread of their own.
+    
+    Args:
+        description: User-provided description of the desired application
+        on_code_chunk: Optional callback receiving application code chunks
+            as they stream from the code generator (called on the loop thread)
+        
+    Returns:
+        Future resolving to (zip_file_path, model_usage_dict)
+    """
+    return submit(_run_pipeline_async(description, on_code_chunk))
+
+
+def run_pipeline(
+    description: str,
+    on_code_chunk: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, Dict[str, Dict[str, int]]]:
     """
     Synchronous entry point for the GUI.
     
     This wrapper allows the async pipeline to be called from synchronous code
-    (like the Gradio interface).
+    (like the Gradio interface). The pipeline runs on the shared background
+    loop, so MCP sessions survive from one call to the next.
     
     Args:
         description: User-provided description of the desired application
+        on_code_chunk: Optional callback receiving application code chunks
+            as they stream from the code generator
         
     Returns:
         Tuple of (zip_file_path, model_usage_dict)
     """
-    return asyncio.run(_run_pipeline_async(description))
+    return start_pipeline(description, on_code_chunk).result()
+
+
+async def _run_pipeline_batch_async(
+    descriptions: List[str],
+) -> List[Union[Tuple[str, Dict[str, Dict[str, int]]], BaseException]]:
+    """
+    Execute several pipelines concurrently on one event loop.
+    
+    The pipelines share the loop's tool-call limiter, so their LLM requests
+    overlap up to MAX_CONCURRENT_TOOL_CALLS at a time.
+    
+    Args:
+        descriptions: Application descriptions, one per pipeline run
+        
+    Returns:
+        One entry per description: the (zip_file_path, model_usage_dict) tuple,
+        or the exception that made that run fail
+    """
+    return await asyncio.gather(
+        *(_run_pipeline_async(description) for description in descriptions),
+        return_exceptions=True,
+    )
+
+
+def run_pipeline_batch(
+    descriptions: List[str],
+) -> List[Union[Tuple[str, Dict[str, Dict[str, int]]], BaseException]]:
+    """
+    Synchronous entry point for batched GUI requests.
+    
+    A failure in one run does not affect the others; its exception is
+    returned in place of the result.
+    
+    Args:
+        descriptions: Application descriptions, one per pipeline run
+        
+    Returns:
+        One (zip_file_path, model_usage_dict) tuple or exception per description
+    """
+    return submit(_run_pipeline_batch_async(descriptions)).result()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+"""
+Optional semantic cache of whole pipeline runs.
+
+Descriptions are embedded with a local sentence-transformers model and kept
+in a FAISS inner-product index next to the generated ZIPs. A new description
+whose nearest neighbor is similar enough (cosine similarity of normalized
+embeddings) reuses that run's ZIP instead of calling the LLM pipeline again.
+
+The cache is opt-in (SEMANTIC_CACHE=1) and needs the extra packages:
+    pip install faiss-cpu sentence-transformers
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, List, Optional
+
+from disk_cache import replace_file
+from orchestrator.zip_util import OUTPUT_DIR
+
+# Set SEMANTIC_CACHE=1 to enable; SEMANTIC_CACHE_THRESHOLD tunes the match
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE", "0") == "1"
+SIMILARITY_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Index and its sidecar mapping index rows to ZIP paths
+INDEX_PATH = OUTPUT_DIR / ".semcache.faiss"
+ENTRIES_PATH = OUTPUT_DIR / ".semcache.json"
+
+
+class SemanticCache:
+    """
+    FAISS index of past descriptions mapped to the ZIPs generated for them.
+    
+    The embedding model and index are loaded on first use. All methods are
+    thread-safe, since the GUI runs pipelines from several worker threads.
+    
+    Attributes:
+        available: False once loading the model or index has failed (for
+            example when the model cannot be downloaded); the cache is then
+            no longer offered by get_semantic_cache()
+    """
+
+    def __init__(
+        self,
+        index_path: Path = INDEX_PATH,
+        entries_path: Path = ENTRIES_PATH,
+        model_name: str = EMBEDDING_MODEL,
+        threshold: float = SIMILARITY_THRESHOLD,
+    ) -> None:
+        """
+        Args:
+            index_path: File the FAISS index is persisted to
+            entries_path: JSON file holding the ZIP path for each index row
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        self.index_path = index_path
+        self.entries_path = entries_path
+        self.model_name = model_name
+        self.threshold = threshold
+        self.available = True
+        self._lock = threading.Lock()
+        self._model: Any = None
+        self._index: Any = None
+        self._entries: List[str] = []
+
+    def _ensure_loaded(self) -> None:
+        """Load the embedding model and the persisted index (caller holds the lock)."""
+        if self._model is not None:
+            return
+
+        # Heavy optional imports are deferred until the cache is actually used
+        import faiss
+        from sentence_transformers import SentenceTransformer
+
+        try:
+            # Downloads the model on first use, which fails when offline
+            model = SentenceTransformer(self.model_name)
+        except Exception:
+            self.available = False
+            raise
+        index = None
+        entries: List[str] = []
+        try:
+            index = faiss.read_index(str(self.index_path))
+            entries = json.loads(self.entries_path.read_text(encoding="utf-8"))
+        except (OSError, RuntimeError, ValueError):
+            index = None
+        if index is None or index.ntotal != len(entries):
+            # Missing or out-of-sync files: start over with an empty index
+            index = faiss.IndexFlatIP(model.get_sentence_embedding_dimension())
+            entries = []
+
+        self._model = model
+        self._index = index
+        self._entries = entries
+
+    def _embed(self, description: str) -> Any:
+        """Embed a description as a normalized float32 row vector."""
+        return self._model.encode(
+            [description],
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).astype("float32")
+
+    def lookup(self, description: str) -> Optional[Path]:
+        """
+        Find the ZIP generated for the most similar previous description.
+        
+        Args:
+            description: User-provided description of the desired application
+        
+        Returns:
+            Path to the cached ZIP, or None if nothing is similar enough
+            (or the matching ZIP no longer exists)
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if self._index.ntotal == 0:
+                return None
+            scores, rows = self._index.search(self._embed(description), 1)
+            score, row = float(scores[0][0]), int(rows[0][0])
+            if row < 0 or score < self.threshold:
+                return None
+            zip_path = Path(self._entries[row])
+        return zip_path if zip_path.is_file() else None
+
+    def add(self, description: str, zip_path: Path) -> None:
+        """
+        Record the ZIP generated for a description and persist the index.
+        
+        Args:
+            description: User-provided description of the desired application
+            zip_path: Path to the ZIP generated for it
+        """
+        import faiss
+
+        with self._lock:
+            self._ensure_loaded()
+            self._index.add(self._embed(description))
+            self._entries.append(str(zip_path))
+
+            # Write both files atomically so a crash never leaves them torn
+            fd, tmp_index = tempfile.mkstemp(dir=self.index_path.parent, suffix=".tmp")
+            os.close(fd)
+            faiss.write_index(self._index, tmp_index)
+            replace_file(tmp_index, self.index_path)
+            fd, tmp_entries = tempfile.mkstemp(dir=self.entries_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            replace_file(tmp_entries, self.entries_path)
+
+
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Return the process-wide semantic cache, if it is enabled and available.
+    
+    Returns:
+        The shared SemanticCache, or None when SEMANTIC_CACHE is not set,
+        faiss / sentence-transformers are not installed, or the embedding
+        model failed to load
+    """
+    global _semantic_cache
+    if not SEMANTIC_CACHE_ENABLED:
+        return None
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            try:
+                import faiss  # noqa: F401
+                import sentence_transformers  # noqa: F401
+            except ImportError:
+                return None
+            _semantic_cache = SemanticCache()
+    return _semantic_cache if _semantic_cache.available else None
@@ -10,6 +10,9 @@ This module handles the creation of ZIP archives containing:
 
 from pathlib import Path
 from datetime import datetime
+import hashlib
+import io
+import time
 import zipfile
 import shutil
 import textwrap
@@ -20,14 +23,69 @@ BASE_DIR = Path(__file__).resolve().parents[1]
 OUTPUT_DIR = BASE_DIR / "generated_output"
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Archives whose contents total fewer characters than this are not compressed
+STORE_THRESHOLD = 8192
 
-def create_zip_from_strings(app_code: str, tests_code: str, description: str) -> Path:
+# Run instructions included in every archive; {generated_at} and
+# {description} are filled in
+README_TEMPLATE = textwrap.dedent(
     """
-    Create a ZIP file containing the generated application and tests.
+    Generated Application
+    Generated at: {generated_at}
+
+    Description:
+    {description}
+
+    ------------------------------
+    HOW TO RUN THE APP
+    ------------------------------
+    1. Make sure you have Python installed (3.9+ recommended).
+    2. Install any required dependencies from the project root, e.g.:
+       pip install -r requirements.txt
+    3. From inside this directory, run:
+       python app.py
+
+    ------------------------------
+    HOW TO RUN THE TESTS
+    ------------------------------
+    1. Install pytest if not already installed:
+       pip install pytest
+    2. From inside this directory, run:
+       pytest test_app.py
+    """
+).strip()
+
+
+def _new_zip_path(seed: str) -> Path:
+    """
+    Pick the path for a new archive in OUTPUT_DIR.
     
-    Creates a temporary directory, writes the application code, test code, and
-    a README file, then packages everything into a ZIP archive. The temporary
-    directory is cleaned up after ZIP creation.
+    Archives are spread over up to 256 shard directories named after the first
+    two hex characters of a per-run hash, so no single directory grows without
+    bound as generations accumulate. File names use the creation time in hex
+    nanoseconds, so they still sort chronologically within a shard.
+    
+    Args:
+        seed: Text identifying the run (hashed together with the current time)
+        
+    Returns:
+        Path for the new ZIP file; its shard directory already exists
+    """
+    # Nanosecond time keeps concurrent pipeline runs from colliding
+    stem = f"{time.time_ns():x}"
+    run_id = hashlib.blake2b((seed + stem).encode("utf-8"), digest_size=8).hexdigest()
+    shard_dir = OUTPUT_DIR / run_id[:2]
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    return shard_dir / f"generated_app_{stem}.zip"
+
+
+def create_zip_bytes(app_code: str, tests_code: str, description: str) -> bytes:
+    """
+    Build the ZIP archive for a generation entirely in memory.
+    
+    The application code, test code and a README with run instructions are
+    written straight into an in-memory archive, so callers that only need to
+    hand the archive on (for example over an API) never touch the disk.
     
     Args:
         app_code: The generated Python application code
@@ -35,57 +93,68 @@ def create_zip_from_strings(app_code: str, tests_code: str, description: str) ->
         description: Original application description (included in README)
         
     Returns:
-        Path to the created ZIP file
+        The ZIP archive as bytes
     """
-    # Create a unique timestamped directory for this generation
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    temp_dir = OUTPUT_DIR / f"generated_app_{timestamp}"
-    temp_dir.mkdir(parents=True, exist_ok=True)
+    # Generate a README with run instructions
+    instructions = README_TEMPLATE.format(
+        generated_at=datetime.now().isoformat(timespec="seconds"),
+        description=description.strip(),
+    )
 
-    # Define file paths within the temporary directory
-    app_path = temp_dir / "app.py"
-    tests_path = temp_dir / "test_app.py"
-    readme_path = temp_dir / "README_RUN_INSTRUCTIONS.txt"
+    # Small archives are stored uncompressed, where deflate costs more CPU than
+    # it saves in bytes; larger ones use the fastest compression level, which
+    # is close to the default level's size on source text
+    total = len(app_code) + len(tests_code) + len(instructions)
+    if total < STORE_THRESHOLD:
+        compression, compresslevel = zipfile.ZIP_STORED, None
+    else:
+        compression, compresslevel = zipfile.ZIP_DEFLATED, 1
 
-    # Write the generated code files
-    app_path.write_text(app_code)
-    tests_path.write_text(tests_code)
+    # Create the ZIP archive
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression, compresslevel=compresslevel) as zf:
+        zf.writestr("app.py", app_code)
+        zf.writestr("test_app.py", tests_code)
+        zf.writestr("README_RUN_INSTRUCTIONS.txt", instructions)
 
-    # Generate a README with run instructions
-    instructions = textwrap.dedent(
-        f"""
-        Generated Application
-
-        Description:
-        {description.strip()}
-
-        ------------------------------
-        HOW TO RUN THE APP
-        ------------------------------
-        1. Make sure you have Python installed (3.9+ recommended).
-        2. Install any required dependencies from the project root, e.g.:
-           pip install -r requirements.txt
-        3. From inside this directory, run:
-           python app.py
-
-        ------------------------------
-        HOW TO RUN THE TESTS
-        ------------------------------
-        1. Install pytest if not already installed:
-           pip install pytest
-        2. From inside this directory, run:
-           pytest test_app.py
-        """
-    ).strip()
-    readme_path.write_text(instructions)
+    return buffer.getvalue()
 
-    # Create the ZIP archive
-    zip_path = OUTPUT_DIR / f"generated_app_{timestamp}.zip"
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-        # Add all files from the temp directory to the ZIP
-        for file in temp_dir.iterdir():
-            zf.write(file, arcname=file.name)
-
-    # Clean up the temporary directory
-    shutil.rmtree(temp_dir, ignore_errors=True)
+
+def create_zip_from_strings(app_code: str, tests_code: str, description: str) -> Path:
+    """
+    Create a ZIP file containing the generated application and tests.
+    
+    The archive is built in memory by create_zip_bytes and written to a
+    shard directory of OUTPUT_DIR in a single write. The pipeline keeps returning a path because
+    the GUI's download component serves files, and the saved archives double
+    as a history of past generations (which the semantic cache reuses).
+    
+    Args:
+        app_code: The generated Python application code
+        tests_code: The generated pytest test code
+        description: Original application description (included in README)
+        
+    Returns:
+        Path to the created ZIP file
+    """
+    zip_path = _new_zip_path(description)
+    zip_path.write_bytes(create_zip_bytes(app_code, tests_code, description))
     return zip_path
+
+
+def copy_zip(zip_path: Path) -> Path:
+    """
+    Copy an existing generated ZIP to a new file in OUTPUT_DIR.
+    
+    Used when a previous result is reused, so every request still gets its
+    own file (which the caller may move or delete independently).
+    
+    Args:
+        zip_path: Path to the ZIP file to copy
+        
+    Returns:
+        Path to the new copy
+    """
+    new_path = _new_zip_path(str(zip_path))
+    shutil.copyfile(zip_path, new_path)
+    return new_path